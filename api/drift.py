@@ -0,0 +1,185 @@
+from typing import Dict, Iterable, List, Optional
+import hashlib
+import json
+import math
+import threading
+from pathlib import Path
+
+import numpy as np
+
+N_PROBA_BINS = 10
+CMS_WIDTH = 2048
+CMS_DEPTH = 4
+TOP_K = 20
+
+# L'histogramme des probas n'est comparable à la baseline que s'il provient du
+# même modèle : c'est celui-ci qui alimente le monitoring et drift_baseline.py.
+REFERENCE_MODEL = "tfidf_logreg"
+
+
+class CountMinSketch:
+    """Count-min sketch : fréquences approchées (sur-estimées) en mémoire fixe."""
+
+    def __init__(self, width: int = CMS_WIDTH, depth: int = CMS_DEPTH):
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        self._rows = np.arange(depth)
+
+    @classmethod
+    def from_table(cls, table) -> "CountMinSketch":
+        table = np.asarray(table, dtype=np.int64)
+        sketch = cls(width=table.shape[1], depth=table.shape[0])
+        sketch.table = table
+        return sketch
+
+    def _indexes(self, token: str) -> np.ndarray:
+        # Double hachage : un seul digest, depth positions dérivées.
+        digest = hashlib.blake2b(token.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return np.array([(h1 + i * h2) % self.width for i in range(self.depth)])
+
+    def add(self, token: str, count: int = 1) -> int:
+        idx = self._indexes(token)
+        self.table[self._rows, idx] += count
+        return int(self.table[self._rows, idx].min())
+
+    def estimate(self, token: str) -> int:
+        return int(self.table[self._rows, self._indexes(token)].min())
+
+
+class DriftMonitor:
+    """Statistiques en flux sur le trafic entrant (mémoire fixe, mise à jour O(1)).
+
+    - taux de tokens hors vocabulaire TF-IDF,
+    - taux de textes vides après prétraitement,
+    - histogramme des probas prédites,
+    - fréquences des tokens (count-min sketch + top-k des plus fréquents).
+    """
+
+    def __init__(self, vocabulary: Iterable[str] = (), top_k: int = TOP_K):
+        self.vocabulary = frozenset(vocabulary)
+        self.top_k = top_k
+        self.sketch = CountMinSketch()
+        self.top_tokens: Dict[str, int] = {}
+        self.proba_counts = np.zeros(N_PROBA_BINS, dtype=np.int64)
+        self.n_texts = 0
+        self.n_empty = 0
+        self.n_tokens = 0
+        self.n_oov = 0
+        self.baseline: Optional[dict] = None
+        self.baseline_sketch: Optional[CountMinSketch] = None
+        self._lock = threading.Lock()
+
+    def _update_top(self, token: str, estimate: int) -> None:
+        if token in self.top_tokens or len(self.top_tokens) < self.top_k:
+            self.top_tokens[token] = estimate
+            return
+        weakest = min(self.top_tokens, key=self.top_tokens.get)
+        if estimate > self.top_tokens[weakest]:
+            del self.top_tokens[weakest]
+            self.top_tokens[token] = estimate
+
+    def update(self, text_clean: str, proba: float) -> None:
+        tokens = text_clean.split()
+        bin_idx = min(int(proba * N_PROBA_BINS), N_PROBA_BINS - 1)
+
+        with self._lock:
+            self.n_texts += 1
+            self.proba_counts[bin_idx] += 1
+            if not tokens:
+                self.n_empty += 1
+            for token in tokens:
+                self.n_tokens += 1
+                if token not in self.vocabulary:
+                    self.n_oov += 1
+                self._update_top(token, self.sketch.add(token))
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            total = self.proba_counts.sum()
+            return {
+                "n_texts": self.n_texts,
+                "n_tokens": self.n_tokens,
+                "oov_rate": self.n_oov / self.n_tokens if self.n_tokens else 0.0,
+                "empty_rate": self.n_empty / self.n_texts if self.n_texts else 0.0,
+                "proba_hist": (
+                    (self.proba_counts / total).tolist()
+                    if total
+                    else [0.0] * N_PROBA_BINS
+                ),
+                "top_tokens": dict(
+                    sorted(self.top_tokens.items(), key=lambda kv: -kv[1])
+                ),
+            }
+
+    def load_baseline(self, path: Path) -> None:
+        if path.exists():
+            baseline = json.loads(path.read_text(encoding="utf-8"))
+            self.baseline_sketch = CountMinSketch.from_table(baseline.pop("cms"))
+            self.baseline = baseline
+            print(f"[drift] Baseline chargée depuis {path}")
+
+    def save_baseline(self, path: Path) -> None:
+        # La table du count-min sketch est sauvegardée pour pouvoir estimer la
+        # fréquence d'entraînement de n'importe quel token du trafic.
+        with self._lock:
+            table = self.sketch.table.tolist()
+        path.write_text(
+            json.dumps({**self.snapshot(), "cms": table}, ensure_ascii=False),
+            encoding="utf-8",
+        )
+        print(f"[drift] Baseline sauvegardée dans {path}")
+
+    def _token_report(self, current: dict) -> dict:
+        """Compare les fréquences (normalisées par n_tokens) des tokens du
+        top-k courant et du top-k de la baseline, estimées par les deux sketchs."""
+        tokens = sorted(set(current["top_tokens"]) | set(self.baseline["top_tokens"]))
+        n_cur = max(current["n_tokens"], 1)
+        n_base = max(self.baseline["n_tokens"], 1)
+
+        with self._lock:
+            cur = [self.sketch.estimate(t) / n_cur for t in tokens]
+        base = [self.baseline_sketch.estimate(t) / n_base for t in tokens]
+
+        top_cur = set(current["top_tokens"])
+        top_base = set(self.baseline["top_tokens"])
+        return {
+            "token_freqs": [
+                {"token": t, "current": c, "baseline": b}
+                for t, c, b in zip(tokens, cur, base)
+            ],
+            # Tous les autres tokens regroupés dans un bin "autres".
+            "psi_tokens": psi(
+                base + [max(1.0 - sum(base), 0.0)], cur + [max(1.0 - sum(cur), 0.0)]
+            ),
+            "top_tokens_overlap": len(top_cur & top_base) / len(top_cur | top_base),
+        }
+
+    def report(self) -> dict:
+        current = self.snapshot()
+        report = {
+            **current,
+            "baseline": self.baseline,
+            "psi_proba": None,
+            "psi_tokens": None,
+            "top_tokens_overlap": None,
+            "token_freqs": [],
+        }
+        if self.baseline is not None and current["n_texts"]:
+            report["psi_proba"] = psi(
+                self.baseline["proba_hist"], current["proba_hist"]
+            )
+        if self.baseline_sketch is not None and current["top_tokens"]:
+            report.update(self._token_report(current))
+        return report
+
+
+def psi(expected: List[float], actual: List[float], eps: float = 1e-4) -> float:
+    """Population Stability Index entre deux histogrammes normalisés."""
+    total = 0.0
+    for e, a in zip(expected, actual):
+        e, a = max(e, eps), max(a, eps)
+        total += (a - e) * math.log(a / e)
+    return total
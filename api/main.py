@@ -1,4 +1,4 @@
-from fastapi import FastAPI, Response
+from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 import os
@@ -20,8 +20,22 @@ from .schemas import (
     FeedbackOut,
     StatsOut,
     WrongFeedbackOut,
+    ModelsOut,
+    DriftOut,
 )
-from .model_loader import load_model, predict_sentiment, label_to_str
+from .model_loader import (
+    load_model,
+    route_prediction_stages,
+    predict_sentiment,
+    label_to_str,
+    available_models,
+    clean_text,
+    get_vocabulary,
+    DEFAULT_MODEL,
+    cascade_stages,
+    MODELS_PATH,
+)
+from .drift import DriftMonitor, REFERENCE_MODEL
 
 
 from dotenv import load_dotenv
@@ -33,6 +47,8 @@ load_dotenv()
 async def lifespan(app: FastAPI):
     load_model()
     print("[main] Modèle initialisé")
+    DRIFT_MONITOR.vocabulary = get_vocabulary()
+    DRIFT_MONITOR.load_baseline(DRIFT_BASELINE_PATH)
     yield
 
 
@@ -52,6 +68,9 @@ ALERT_THRESHOLD = 3
 
 WRONG_FEEDBACKS = deque(maxlen=100)
 
+DRIFT_MONITOR = DriftMonitor()
+DRIFT_BASELINE_PATH = MODELS_PATH / "drift_baseline.json"
+
 
 ALERT_EMAIL_ENABLED = os.getenv("ALERT_EMAIL_ENABLED", "True").lower() == "true"
 ALERT_EMAIL_FROM = os.getenv("ALERT_EMAIL_FROM")
@@ -100,19 +119,53 @@ def health() -> HealthOut:
 def predict(request: TweetIn) -> PredictionOut:
     global TOTAL_PREDICTIONS
 
-    label, proba = predict_sentiment(request.text)
+    model_name = request.model or DEFAULT_MODEL
+    try:
+        label, proba, model_used, stage_probas = route_prediction_stages(
+            request.text, model_name
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     label_str = label_to_str(label)
 
     TOTAL_PREDICTIONS += 1
+    _update_drift(request.text, stage_probas)
 
     return PredictionOut(
         label=label,
         label_str=label_str,
         proba=proba,
+        model=model_used,
         text=request.text,
     )
 
 
+def _update_drift(text: str, stage_probas: dict) -> None:
+    # Histogramme de dérive toujours alimenté par le modèle de la baseline :
+    # la cascade ou un autre modèle déformeraient la distribution des probas.
+    # Le monitoring ne doit jamais faire échouer une prédiction déjà servie.
+    try:
+        proba_ref = stage_probas.get(REFERENCE_MODEL)
+        if proba_ref is None:
+            _, proba_ref = predict_sentiment(text, REFERENCE_MODEL)
+        DRIFT_MONITOR.update(clean_text(text, "simple"), proba_ref)
+    except Exception as e:
+        print(f"[drift] Mise à jour ignorée : {e}")
+
+
+@app.get("/models", response_model=ModelsOut)
+def models() -> ModelsOut:
+    """Liste les modèles servis (artefact présent) et les étages actifs de la
+    cascade (ceux dont l'artefact manque en sont retirés)."""
+    return ModelsOut(
+        default=DEFAULT_MODEL,
+        available=available_models(),
+        cascade=cascade_stages(),
+    )
+
+
 @app.post("/feedback", response_model=FeedbackOut)
 def feedback(request: FeedbackIn) -> FeedbackOut:
     if not request.is_correct:
@@ -246,6 +299,12 @@ def get_stats() -> StatsOut:
     )
 
 
+@app.get("/drift", response_model=DriftOut)
+def get_drift() -> DriftOut:
+    """Statistiques du trafic entrant comparées à la baseline d'entraînement."""
+    return DriftOut(**DRIFT_MONITOR.report())
+
+
 @app.get("/wrong_feedbacks", response_model=list[WrongFeedbackOut])
 def get_wrong_feedbacks(limit: int = 20) -> list[WrongFeedbackOut]:
     """Renvoie les derniers feedbacks négatifs pour analyse."""
@@ -1,38 +1,221 @@
+from functools import lru_cache
 from pathlib import Path
-from typing import Tuple
+from typing import Dict, FrozenSet, List, Tuple
+import json
+import os
 import sys
 
 import joblib
+import numpy as np
 
 ROOT = Path(__file__).resolve().parents[1]
 SCRIPTS_PATH = ROOT / "scripts"
 MODELS_PATH = ROOT / "models"
+OUT_PATH = ROOT / "out"
 
 sys.path.append(str(SCRIPTS_PATH))
 
-from preprocessing import preprocess_simple
+from preprocessing import preprocess
 
 MODEL_PATH = MODELS_PATH / "tfidf_logreg.joblib"
+ONNX_MODEL_PATH = MODELS_PATH / "tfidf_logreg.onnx"
 
-_model = None
+# Backend du modèle TF-IDF par défaut : "sklearn" (joblib) ou "onnx"
+# (ONNX Runtime CPU, artefact généré par scripts/export_onnx.py).
+MODEL_BACKEND = os.getenv("MODEL_BACKEND", "sklearn")
+ONNX_NUM_THREADS = int(os.getenv("ONNX_NUM_THREADS", "0"))  # 0 = auto
 
+# Modèles servis par l'API : artefact + mode de prétraitement associé.
+# - "sklearn" : pipeline joblib (notebook 3)
+# - "onnx" : même pipeline exporté en ONNX (scripts/export_onnx.py)
+# - "keras" : dossier model.keras + tokenizer.json + config.json (notebook 4,
+#   cellule d'export)
+# - "transformers" : dossier save_pretrained du modèle + tokenizer (notebook 5,
+#   save_dir = out/modernbert_model)
+MODEL_REGISTRY: Dict[str, dict] = {
+    "tfidf_logreg": {"path": MODEL_PATH, "mode": "simple", "kind": "sklearn"},
+    "tfidf_logreg_onnx": {
+        "path": ONNX_MODEL_PATH,
+        "mode": "simple",
+        "kind": "onnx",
+    },
+    "lstm_glove": {
+        "path": MODELS_PATH / "lstm_glove",
+        "mode": "advanced",
+        "kind": "keras",
+    },
+    "bilstm_fasttext": {
+        "path": MODELS_PATH / "bilstm_fasttext",
+        "mode": "advanced",
+        "kind": "keras",
+    },
+    "modernbert": {
+        "path": OUT_PATH / "modernbert_model",
+        "mode": "bert",
+        "kind": "transformers",
+    },
+}
 
-def load_model():
-    global _model
-    if _model is None:
+# Versions produites par scripts/train_search.py (tfidf_logreg_v2.joblib, ...).
+for _path in sorted(MODELS_PATH.glob("tfidf_logreg_v*.joblib")):
+    MODEL_REGISTRY[_path.stem] = {"path": _path, "mode": "simple", "kind": "sklearn"}
+
+if MODEL_BACKEND == "onnx":
+    MODEL_REGISTRY["tfidf_logreg"] = MODEL_REGISTRY["tfidf_logreg_onnx"]
+elif MODEL_BACKEND != "sklearn":
+    raise ValueError(f"Backend non supporté : {MODEL_BACKEND}")
+
+DEFAULT_MODEL = os.getenv("DEFAULT_MODEL", "tfidf_logreg")
+
+# Cascade : le premier modèle (rapide) répond, le second (plus lourd) n'est
+# appelé que si la proba du premier reste dans [0.5 - marge, 0.5 + marge].
+CASCADE_NAME = "cascade"
+CASCADE_MODELS = os.getenv("CASCADE_MODELS", "tfidf_logreg,lstm_glove").split(",")
+CASCADE_MARGIN = float(os.getenv("CASCADE_MARGIN", "0.15"))
+
+_unknown = [name for name in CASCADE_MODELS if name not in MODEL_REGISTRY]
+if _unknown:
+    raise ValueError(f"CASCADE_MODELS contient des modèles inconnus : {_unknown}")
+
+_models: Dict[str, object] = {}
+_missing_cascade_stages: set = set()
+_vocabulary: FrozenSet[str] | None = None
+
+
+@lru_cache(maxsize=4096)
+def clean_text(text: str, mode: str = "simple") -> str:
+    """preprocess() avec cache : évite de refaire le prétraitement NLTK quand
+    un même texte est utilisé par plusieurs modèles ou par le monitoring."""
+    return preprocess(text, mode=mode)
+
+
+class OnnxSentimentModel:
+    """Enveloppe une session ONNX Runtime (CPU) derrière predict_proba."""
+
+    def __init__(self, path: Path, num_threads: int = ONNX_NUM_THREADS):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        if num_threads > 0:
+            options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(
+            str(path), sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self.input_name = self.session.get_inputs()[0].name
+        self.proba_name = self.session.get_outputs()[1].name
+
+    def predict_proba(self, texts: List[str]) -> np.ndarray:
+        inputs = np.asarray(texts, dtype=object).reshape(-1, 1)
+        return self.session.run([self.proba_name], {self.input_name: inputs})[0]
+
+
+class KerasSentimentModel:
+    """Enveloppe un modèle Keras (LSTM + embeddings) derrière predict_proba."""
+
+    def __init__(self, path: Path):
+        import tensorflow as tf
+        from tensorflow.keras.preprocessing.text import tokenizer_from_json
+
+        self.model = tf.keras.models.load_model(path / "model.keras")
+        self.tokenizer = tokenizer_from_json(
+            (path / "tokenizer.json").read_text(encoding="utf-8")
+        )
+        config = json.loads((path / "config.json").read_text(encoding="utf-8"))
+        self.max_len = int(config["max_len"])
+
+    def predict_proba(self, texts: List[str]) -> np.ndarray:
+        from tensorflow.keras.preprocessing.sequence import pad_sequences
+
+        seqs = self.tokenizer.texts_to_sequences(texts)
+        padded = pad_sequences(
+            seqs, maxlen=self.max_len, padding="post", truncating="post"
+        )
+        # Appel direct plutôt que model.predict() : predict() reconstruit un
+        # pipeline de données à chaque appel, trop coûteux pour un seul tweet.
+        proba_pos = self.model(padded, training=False).numpy().ravel()
+        return np.column_stack([1.0 - proba_pos, proba_pos])
+
+
+class TransformersSentimentModel:
+    """Enveloppe un modèle ModernBERT fine-tuné derrière predict_proba (CPU)."""
+
+    def __init__(self, path: Path, max_length: int = 64):
+        import torch
+        from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+        self.torch = torch
+        self.tokenizer = AutoTokenizer.from_pretrained(path)
+        self.model = AutoModelForSequenceClassification.from_pretrained(path)
+        self.model.eval()
+        self.max_length = max_length
+
+    def predict_proba(self, texts: List[str]) -> np.ndarray:
+        enc = self.tokenizer(
+            texts,
+            truncation=True,
+            padding=True,
+            max_length=self.max_length,
+            return_tensors="pt",
+        )
+        with self.torch.no_grad():
+            logits = self.model(**enc).logits
+        return self.torch.softmax(logits, dim=-1).cpu().numpy()
+
+
+def _get_spec(name: str) -> dict:
+    if name not in MODEL_REGISTRY:
+        raise ValueError(
+            f"Modèle inconnu : {name} (disponibles : {', '.join(MODEL_REGISTRY)})"
+        )
+    return MODEL_REGISTRY[name]
+
+
+def available_models() -> List[str]:
+    return [name for name, spec in MODEL_REGISTRY.items() if spec["path"].exists()]
+
+
+def load_model(name: str = DEFAULT_MODEL):
+    spec = _get_spec(name)
+    if name not in _models:
+        path = spec["path"]
+        if not path.exists():
+            raise FileNotFoundError(f"Modèle introuvable à l'emplacement : {path}")
+
+        if spec["kind"] == "sklearn":
+            model = joblib.load(path)
+        elif spec["kind"] == "onnx":
+            model = OnnxSentimentModel(path)
+        elif spec["kind"] == "keras":
+            model = KerasSentimentModel(path)
+        elif spec["kind"] == "transformers":
+            model = TransformersSentimentModel(path)
+        else:
+            raise ValueError(f"Type de modèle non supporté : {spec['kind']}")
+
+        _models[name] = model
+        print(f"[model_loader] Modèle '{name}' chargé depuis {path}")
+    return _models[name]
+
+
+def get_vocabulary() -> FrozenSet[str]:
+    """Vocabulaire (unigrammes) du TF-IDF déployé, pour le suivi des dérives."""
+    global _vocabulary
+    if _vocabulary is None:
         if not MODEL_PATH.exists():
             raise FileNotFoundError(
                 f"Modèle introuvable à l'emplacement : {MODEL_PATH}"
             )
-        _model = joblib.load(MODEL_PATH)
-        print(f"[model_loader] Modèle chargé depuis {MODEL_PATH}")
-    return _model
+        pipe = joblib.load(MODEL_PATH)
+        _vocabulary = frozenset(
+            term for term in pipe.named_steps["tfidf"].vocabulary_ if " " not in term
+        )
+    return _vocabulary
 
 
-def predict_sentiment(text: str) -> Tuple[int, float]:
-    model = load_model()
+def _predict_with(name: str, text: str) -> Tuple[int, float]:
+    model = load_model(name)
 
-    text_clean = preprocess_simple(text)
+    text_clean = clean_text(text, MODEL_REGISTRY[name]["mode"])
 
     proba_pos = model.predict_proba([text_clean])[0][1]
     label = int(proba_pos >= 0.5)
@@ -40,6 +223,82 @@ def predict_sentiment(text: str) -> Tuple[int, float]:
     return label, float(proba_pos)
 
 
+def predict_sentiment_batch(
+    texts: List[str], model_name: str = DEFAULT_MODEL
+) -> List[Tuple[int, float]]:
+    """Prédit un lot de textes en un seul appel au modèle."""
+    model = load_model(model_name)
+    mode = MODEL_REGISTRY[model_name]["mode"]
+
+    texts_clean = [clean_text(t, mode) for t in texts]
+
+    probas_pos = model.predict_proba(texts_clean)[:, 1]
+    return [(int(p >= 0.5), float(p)) for p in probas_pos]
+
+
+def cascade_stages() -> List[str]:
+    """Étages de la cascade réellement actifs (artefact présent).
+
+    Un étage manquant est signalé une seule fois dans les logs : sans lui,
+    la cascade se comporte comme son premier modèle seul.
+    """
+    first, *heavier = CASCADE_MODELS
+    stages = [first]
+    for name in heavier:
+        if _get_spec(name)["path"].exists():
+            stages.append(name)
+        elif name not in _missing_cascade_stages:
+            _missing_cascade_stages.add(name)
+            print(
+                f"[model_loader] Étage de cascade '{name}' ignoré : artefact "
+                f"introuvable ({MODEL_REGISTRY[name]['path']})"
+            )
+    return stages
+
+
+def _predict_cascade(text: str) -> Tuple[int, float, str, Dict[str, float]]:
+    first, *heavier = cascade_stages()
+    label, proba = _predict_with(first, text)
+    used = first
+    probas = {first: proba}
+
+    for name in heavier:
+        if abs(proba - 0.5) >= CASCADE_MARGIN:
+            break
+        label, proba = _predict_with(name, text)
+        used = name
+        probas[name] = proba
+
+    return label, proba, used, probas
+
+
+def route_prediction_stages(
+    text: str, model_name: str = DEFAULT_MODEL
+) -> Tuple[int, float, str, Dict[str, float]]:
+    """Comme route_prediction, avec en plus la proba de chaque modèle
+    interrogé (tous les étages parcourus pour la cascade)."""
+    if model_name == CASCADE_NAME:
+        return _predict_cascade(text)
+
+    label, proba = _predict_with(model_name, text)
+    return label, proba, model_name, {model_name: proba}
+
+
+def route_prediction(
+    text: str, model_name: str = DEFAULT_MODEL
+) -> Tuple[int, float, str]:
+    """Prédit avec le modèle demandé et renvoie (label, proba, modèle utilisé)."""
+    label, proba, used, _ = route_prediction_stages(text, model_name)
+    return label, proba, used
+
+
+def predict_sentiment(
+    text: str, model_name: str = DEFAULT_MODEL
+) -> Tuple[int, float]:
+    label, proba, _ = route_prediction(text, model_name)
+    return label, proba
+
+
 def label_to_str(label: int) -> str:
     return "negative" if label == 0 else "positive"
 
@@ -49,3 +308,4 @@ if __name__ == "__main__":
     lab, proba = predict_sentiment(exemple)
     print("Texte :", exemple)
     print("Label :", lab, "(", label_to_str(lab), ")", "Proba classe 1 :", proba)
+    print("Modèles disponibles :", available_models())
@@ -8,12 +8,14 @@ class HealthOut(BaseModel):
 
 class TweetIn(BaseModel):
     text: str
+    model: str | None = None  # nom du modèle ou "cascade" (défaut : DEFAULT_MODEL)
 
 
 class PredictionOut(BaseModel):
     label: int  # 0 ou 1
     label_str: str  # "negative" ou "positive"
     proba: float  # % proba de la classe positive
+    model: str  # modèle ayant produit la prédiction
 
 
 class FeedbackIn(BaseModel):
@@ -38,3 +40,32 @@ class WrongFeedbackOut(BaseModel):
     predicted_label: int
     proba: float
     timestamp: datetime
+
+
+class ModelsOut(BaseModel):
+    default: str
+    available: list[str]
+    cascade: list[str]
+
+
+class DriftBaselineOut(BaseModel):
+    n_texts: int
+    n_tokens: int
+    oov_rate: float
+    empty_rate: float
+    proba_hist: list[float]
+    top_tokens: dict[str, int]
+
+
+class TokenFreqOut(BaseModel):
+    token: str
+    current: float  # fréquence dans le trafic (occurrences / n_tokens)
+    baseline: float  # fréquence dans les données d'entraînement
+
+
+class DriftOut(DriftBaselineOut):
+    baseline: DriftBaselineOut | None = None
+    psi_proba: float | None = None  # Population Stability Index des probas
+    psi_tokens: float | None = None  # PSI des fréquences des tokens du top-k
+    top_tokens_overlap: float | None = None  # Jaccard top-k trafic / baseline
+    token_freqs: list[TokenFreqOut] = []
@@ -9,6 +9,8 @@ PREDICT_URL = f"{API_BASE_URL}/predict"
 FEEDBACK_URL = f"{API_BASE_URL}/feedback"
 STATS_URL = f"{API_BASE_URL}/stats"
 WRONG_FEEDBACKS_URL = f"{API_BASE_URL}/wrong_feedbacks"
+MODELS_URL = f"{API_BASE_URL}/models"
+DRIFT_URL = f"{API_BASE_URL}/drift"
 
 st.set_page_config(
     page_title="AirParadis - Sentiment sur tweets",
@@ -40,7 +42,8 @@ Cet onglet permet de **suivre le modèle en production** :
 - Nombre total de prédictions,
 - Nombre de prédictions jugées incorrectes,
 - Taux d'erreur,
-- Liste des derniers tweets mal prédits.
+- Liste des derniers tweets mal prédits,
+- Dérive du trafic entrant (hors vocabulaire, textes vides, distribution des probas).
 """
     )
 
@@ -48,9 +51,19 @@ if "last_prediction" not in st.session_state:
     st.session_state.last_prediction = None
 
 
-def call_predict_api(text: str):
+def get_available_models():
     try:
-        response = requests.post(PREDICT_URL, json={"text": text})
+        response = requests.get(MODELS_URL, timeout=5)
+        if response.status_code == 200:
+            return response.json()["available"] + ["cascade"]
+    except Exception:
+        pass
+    return ["tfidf_logreg"]
+
+
+def call_predict_api(text: str, model: str | None = None):
+    try:
+        response = requests.post(PREDICT_URL, json={"text": text, "model": model})
         if response.status_code != 200:
             st.error(f"Erreur API /predict : {response.status_code}")
             return None
@@ -91,12 +104,15 @@ if mode == "Prédiction":
     with col1:
         predict_btn = st.button("Prédire le sentiment", type="primary")
 
+    with col2:
+        model_choice = st.selectbox("Modèle :", get_available_models())
+
     if predict_btn:
         if not text_input.strip():
             st.warning("Merci d'entrer un texte avant de prédire.")
         else:
             with st.spinner("Appel à l'API de prédiction..."):
-                result = call_predict_api(text_input.strip())
+                result = call_predict_api(text_input.strip(), model_choice)
 
             if result is not None:
                 st.session_state.last_prediction = {
@@ -109,7 +125,8 @@ if mode == "Prédiction":
                 st.subheader("Résultat de la prédiction")
                 st.write(
                     f"**Sentiment prédit :** `{result['label_str']}` "
-                    f"(label = {result['label']}, proba = {result['proba']:.3f})"
+                    f"(label = {result['label']}, proba = {result['proba']:.3f}, "
+                    f"modèle = {result['model']})"
                 )
 
     st.markdown("---")
@@ -198,6 +215,93 @@ else:
     except Exception as e:
         st.error(f"Impossible de récupérer les feedbacks : {e}")
 
+    st.markdown("---")
+    st.subheader("Dérive des données entrantes")
+
+    # 3) Dérive : trafic courant vs baseline d'entraînement
+    try:
+        resp_drift = requests.get(DRIFT_URL, timeout=5)
+        if resp_drift.status_code == 200:
+            drift = resp_drift.json()
+            baseline = drift["baseline"]
+
+            col1, col2, col3 = st.columns(3)
+            col1.metric(
+                "Tokens hors vocabulaire",
+                f"{drift['oov_rate']:.1%}",
+                delta=(
+                    f"{drift['oov_rate'] - baseline['oov_rate']:+.1%}"
+                    if baseline
+                    else None
+                ),
+                delta_color="inverse",
+            )
+            col2.metric(
+                "Textes vides après prétraitement",
+                f"{drift['empty_rate']:.1%}",
+                delta=(
+                    f"{drift['empty_rate'] - baseline['empty_rate']:+.1%}"
+                    if baseline
+                    else None
+                ),
+                delta_color="inverse",
+            )
+            col3.metric(
+                "PSI des probas",
+                f"{drift['psi_proba']:.3f}" if drift["psi_proba"] is not None else "-",
+            )
+
+            n_bins = len(drift["proba_hist"])
+            chart = {
+                "Bin proba": [f"{i / n_bins:.1f}" for i in range(n_bins)],
+                "Trafic": drift["proba_hist"],
+            }
+            if baseline:
+                chart["Baseline"] = baseline["proba_hist"]
+            st.bar_chart(chart, x="Bin proba", stack=False)
+
+            col4, col5 = st.columns(2)
+            col4.metric(
+                "PSI des tokens",
+                (
+                    f"{drift['psi_tokens']:.3f}"
+                    if drift["psi_tokens"] is not None
+                    else "-"
+                ),
+            )
+            col5.metric(
+                "Recouvrement top tokens",
+                (
+                    f"{drift['top_tokens_overlap']:.0%}"
+                    if drift["top_tokens_overlap"] is not None
+                    else "-"
+                ),
+            )
+
+            if drift["token_freqs"]:
+                st.write("Fréquence des tokens, trafic vs baseline :")
+                st.bar_chart(
+                    {
+                        "Token": [it["token"] for it in drift["token_freqs"]],
+                        "Trafic": [it["current"] for it in drift["token_freqs"]],
+                        "Baseline": [it["baseline"] for it in drift["token_freqs"]],
+                    },
+                    x="Token",
+                    stack=False,
+                )
+            elif drift["top_tokens"]:
+                st.write("Tokens les plus fréquents (count-min sketch) :")
+                st.table(
+                    [
+                        {"Token": tok, "Occurrences (approx.)": n}
+                        for tok, n in drift["top_tokens"].items()
+                    ]
+                )
+        else:
+            st.error(f"Erreur API /drift : {resp_drift.status_code}")
+    except Exception as e:
+        st.error(f"Impossible de récupérer les statistiques de dérive : {e}")
+
     st.caption(
         "Onglet monitoring : "
         "statistiques globales, erreurs récentes et base pour analyser les dérives du modèle."
@@ -0,0 +1,81 @@
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+API_PATH = ROOT / "api"
+sys.path.append(str(API_PATH))
+
+from model_loader import load_model, predict_sentiment, predict_sentiment_batch
+
+SAMPLE_TWEETS = [
+    "I love this airline, great service!",
+    "Worst flight ever, my luggage is lost again",
+    "The crew was friendly but the seats were not comfortable",
+    "Flight delayed for 3 hours, no information at all",
+    "Thanks for the upgrade, amazing experience",
+    "Not sure how I feel about the new menu",
+    "@AirParadis never flying with you again http://t.co/xyz",
+    "Smooth landing and on time, well done",
+]
+
+
+def bench_single(model_name: str, texts: list[str], repeat: int) -> dict:
+    latencies = []
+    for _ in range(repeat):
+        for text in texts:
+            start = time.perf_counter()
+            predict_sentiment(text, model_name)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    latencies.sort()
+    return {
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[int(0.95 * (len(latencies) - 1))],
+        "mean_ms": statistics.fmean(latencies),
+    }
+
+
+def bench_batch(model_name: str, texts: list[str], batch_size: int, repeat: int):
+    batch = (texts * (batch_size // len(texts) + 1))[:batch_size]
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        predict_sentiment_batch(batch, model_name)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "batch_ms": elapsed / repeat * 1000,
+        "tweets_per_s": batch_size * repeat / elapsed,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Latence unitaire et par lot des backends sklearn / ONNX."
+    )
+    parser.add_argument(
+        "--models", nargs="+", default=["tfidf_logreg", "tfidf_logreg_onnx"]
+    )
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=[32, 256, 1024])
+    args = parser.parse_args()
+
+    for name in args.models:
+        load_model(name)
+        predict_sentiment(SAMPLE_TWEETS[0], name)  # warm-up
+
+        single = bench_single(name, SAMPLE_TWEETS, args.repeat)
+        print(
+            f"[{name}] unitaire : p50={single['p50_ms']:.3f} ms, "
+            f"p95={single['p95_ms']:.3f} ms, moyenne={single['mean_ms']:.3f} ms"
+        )
+
+        for bs in args.batch_sizes:
+            res = bench_batch(name, SAMPLE_TWEETS, bs, max(1, args.repeat // 10))
+            print(
+                f"[{name}] lot de {bs} : {res['batch_ms']:.2f} ms/lot, "
+                f"{res['tweets_per_s']:.0f} tweets/s"
+            )
@@ -0,0 +1,54 @@
+import argparse
+import sys
+from pathlib import Path
+
+import pandas as pd
+from tqdm.auto import tqdm
+
+ROOT = Path(__file__).resolve().parents[1]
+API_PATH = ROOT / "api"
+DATA_PATH = ROOT / "data"
+sys.path.append(str(API_PATH))
+
+from drift import DriftMonitor, REFERENCE_MODEL
+from model_loader import (
+    MODELS_PATH,
+    clean_text,
+    get_vocabulary,
+    predict_sentiment_batch,
+)
+
+DEFAULT_CSV = DATA_PATH / "training.1600000.processed.noemoticon.csv"
+DEFAULT_OUTPUT = MODELS_PATH / "drift_baseline.json"
+COLUMNS = ["target", "ids", "date", "flag", "user", "text"]
+
+
+def compute_baseline(
+    texts: list[str], batch_size: int = 1024, output_path: Path = DEFAULT_OUTPUT
+) -> DriftMonitor:
+    monitor = DriftMonitor(get_vocabulary())
+
+    for start in tqdm(range(0, len(texts), batch_size), desc="Baseline drift"):
+        batch = texts[start : start + batch_size]
+        preds = predict_sentiment_batch(batch, REFERENCE_MODEL)
+        for text, (_, proba) in zip(batch, preds):
+            monitor.update(clean_text(text, "simple"), proba)
+
+    monitor.save_baseline(output_path)
+    return monitor
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Calcule la baseline de dérive sur les tweets d'entraînement."
+    )
+    parser.add_argument("--csv", type=Path, default=DEFAULT_CSV)
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("--sample-size", type=int, default=100_000)
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.csv, encoding="latin-1", header=None, names=COLUMNS)
+    if len(df) > args.sample_size:
+        df = df.sample(args.sample_size, random_state=42)
+
+    compute_baseline(df["text"].astype(str).tolist(), output_path=args.output)
@@ -0,0 +1,57 @@
+import argparse
+from pathlib import Path
+
+import joblib
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from skl2onnx import convert_sklearn
+from skl2onnx.common.data_types import StringTensorType
+
+
+ROOT = Path(__file__).resolve().parents[1]
+MODELS_PATH = ROOT / "models"
+
+DEFAULT_INPUT = MODELS_PATH / "tfidf_logreg.joblib"
+DEFAULT_OUTPUT = MODELS_PATH / "tfidf_logreg.onnx"
+
+
+def export_tfidf_logreg(
+    model_path: Path = DEFAULT_INPUT,
+    output_path: Path = DEFAULT_OUTPUT,
+    target_opset: int | None = None,
+) -> Path:
+    pipe = joblib.load(model_path)
+
+    # Entrée : un texte déjà prétraité (preprocess_simple) par ligne.
+    # zipmap=False -> probabilités renvoyées sous forme de tenseur (n, 2).
+    # locale C.UTF-8 : skl2onnx écrit en_US.UTF-8 par défaut dans le
+    # StringNormalizer, absente des images slim / conteneurs ; le texte est
+    # de toute façon déjà en ASCII minuscule après preprocess_simple.
+    onx = convert_sklearn(
+        pipe,
+        initial_types=[("text", StringTensorType([None, 1]))],
+        options={
+            LogisticRegression: {"zipmap": False},
+            TfidfVectorizer: {"locale": "C.UTF-8"},
+        },
+        target_opset=target_opset,
+    )
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_bytes(onx.SerializeToString())
+    print(f"[export_onnx] Modèle ONNX sauvegardé dans : {output_path}")
+
+    return output_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Export du pipeline TF-IDF + LogReg au format ONNX."
+    )
+    parser.add_argument("--model", type=Path, default=DEFAULT_INPUT)
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("--opset", type=int, default=None)
+    args = parser.parse_args()
+
+    export_tfidf_logreg(args.model, args.output, args.opset)
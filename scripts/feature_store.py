@@ -0,0 +1,229 @@
+from contextlib import contextmanager
+import hashlib
+import inspect
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Iterator, List, Sequence, Tuple
+
+import joblib
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+from tqdm.auto import tqdm
+
+import preprocessing
+from preprocessing import preprocess
+
+ROOT = Path(__file__).resolve().parents[1]
+FEATURES_PATH = ROOT / "data" / "features"
+
+# Empreinte du code de prétraitement : le modifier invalide le cache.
+PREPROCESSING_VERSION = hashlib.sha1(
+    inspect.getsource(preprocessing).encode("utf-8")
+).hexdigest()[:12]
+
+TfidfFeatures = Tuple[sparse.csr_matrix, sparse.csr_matrix, TfidfVectorizer]
+
+
+def cache_key(**parts) -> str:
+    """Clé stable à partir du mode de prétraitement, des params, des données..."""
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def fingerprint_texts(texts: Sequence[str]) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    for text in texts:
+        h.update(str(text).encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+@contextmanager
+def _atomic_dir(path: Path):
+    """Écrit une entrée de cache dans un dossier temporaire voisin, renommé en
+    `path` (os.replace) seulement une fois tous les fichiers écrits : un
+    processus interrompu ne laisse jamais d'entrée partielle sous `path`."""
+    tmp = path.with_name(path.name + f".tmp-{os.getpid()}")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+    try:
+        yield tmp
+        os.replace(tmp, path)
+    except OSError:
+        # Un autre processus a publié la même entrée entre-temps : on la garde.
+        if not path.is_dir():
+            raise
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def save_csr(matrix: sparse.csr_matrix, path: Path) -> None:
+    # .npy séparés (et non .npz compressé) pour pouvoir les memory-mapper.
+    path.mkdir(parents=True, exist_ok=True)
+    matrix = sparse.csr_matrix(matrix)
+    np.save(path / "data.npy", matrix.data)
+    np.save(path / "indices.npy", matrix.indices)
+    np.save(path / "indptr.npy", matrix.indptr)
+    (path / "shape.json").write_text(json.dumps(list(matrix.shape)))
+
+
+def load_csr(path: Path, mmap: bool = True) -> sparse.csr_matrix:
+    mmap_mode = "r" if mmap else None
+    data = np.load(path / "data.npy", mmap_mode=mmap_mode)
+    indices = np.load(path / "indices.npy", mmap_mode=mmap_mode)
+    indptr = np.load(path / "indptr.npy", mmap_mode=mmap_mode)
+    shape = tuple(json.loads((path / "shape.json").read_text()))
+    return sparse.csr_matrix((data, indices, indptr), shape=shape, copy=False)
+
+
+class TokenizedCorpus:
+    """Textes prétraités stockés en ids de tokens (tableau plat + offsets).
+
+    Les tableaux sont memory-mappés : seuls les documents lus sont chargés.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.token_ids = np.load(path / "token_ids.npy", mmap_mode="r")
+        self.offsets = np.load(path / "offsets.npy", mmap_mode="r")
+        self.vocab: List[str] = json.loads(
+            (path / "vocab.json").read_text(encoding="utf-8")
+        )
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def ids(self, i: int) -> np.ndarray:
+        return self.token_ids[self.offsets[i] : self.offsets[i + 1]]
+
+    def __getitem__(self, i: int) -> str:
+        return " ".join(self.vocab[t] for t in self.ids(i))
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(len(self)):
+            yield self[i]
+
+    @classmethod
+    def build(cls, texts_clean: Sequence[str], path: Path) -> "TokenizedCorpus":
+        vocab_index: dict = {}
+        token_ids: List[int] = []
+        offsets = [0]
+        for text in texts_clean:
+            for tok in text.split():
+                token_ids.append(vocab_index.setdefault(tok, len(vocab_index)))
+            offsets.append(len(token_ids))
+
+        with _atomic_dir(path) as tmp:
+            token_ids = np.asarray(token_ids, dtype=np.int32)
+            np.save(tmp / "token_ids.npy", token_ids)
+            np.save(tmp / "offsets.npy", np.asarray(offsets, dtype=np.int64))
+            (tmp / "vocab.json").write_text(
+                json.dumps(list(vocab_index), ensure_ascii=False), encoding="utf-8"
+            )
+        return cls(path)
+
+
+def get_preprocessed(
+    texts: Sequence[str], mode: str = "simple", root: Path = FEATURES_PATH
+) -> TokenizedCorpus:
+    """Prétraite les textes (ou relit le cache existant pour ce mode / ces données)."""
+    key = cache_key(
+        mode=mode, data=fingerprint_texts(texts), version=PREPROCESSING_VERSION
+    )
+    path = root / "preprocessed" / f"{mode}_{key}"
+
+    if path.is_dir():
+        print(f"[feature_store] Prétraitement '{mode}' relu depuis {path}")
+        return TokenizedCorpus(path)
+
+    texts_clean = [
+        preprocess(t, mode=mode) for t in tqdm(texts, desc=f"Preprocessing ({mode})")
+    ]
+    print(f"[feature_store] Prétraitement '{mode}' sauvegardé dans {path}")
+    return TokenizedCorpus.build(texts_clean, path)
+
+
+def _load_tfidf(path: Path) -> TfidfFeatures:
+    print(f"[feature_store] Features TF-IDF relues depuis {path}")
+    return (
+        load_csr(path / "train"),
+        load_csr(path / "test"),
+        joblib.load(path / "vectorizer.joblib"),
+    )
+
+
+def _build_tfidf(path: Path, train_docs, test_docs, params: dict) -> TfidfFeatures:
+    vectorizer = TfidfVectorizer(**params)
+    X_train = vectorizer.fit_transform(train_docs)
+    X_test = vectorizer.transform(test_docs)
+
+    with _atomic_dir(path) as tmp:
+        save_csr(X_train, tmp / "train")
+        save_csr(X_test, tmp / "test")
+        (tmp / "params.json").write_text(json.dumps(params, default=str))
+        joblib.dump(vectorizer, tmp / "vectorizer.joblib")
+    print(f"[feature_store] Features TF-IDF sauvegardées dans {path}")
+
+    return load_csr(path / "train"), load_csr(path / "test"), vectorizer
+
+
+def get_tfidf(
+    train_texts: Sequence[str],
+    test_texts: Sequence[str],
+    mode: str = "simple",
+    root: Path = FEATURES_PATH,
+    **vectorizer_params,
+) -> TfidfFeatures:
+    """Matrices TF-IDF train / test (vectorizer fitté sur le train), en cache.
+
+    La clé dépend des données brutes, du mode et du code de prétraitement et
+    des paramètres du TfidfVectorizer : changer l'un d'eux recalcule les
+    features.
+    """
+    key = cache_key(
+        mode=mode,
+        train=fingerprint_texts(train_texts),
+        test=fingerprint_texts(test_texts),
+        params=vectorizer_params,
+        version=PREPROCESSING_VERSION,
+    )
+    path = root / "tfidf" / f"{mode}_{key}"
+
+    if path.is_dir():
+        return _load_tfidf(path)
+
+    train_clean = get_preprocessed(train_texts, mode, root)
+    test_clean = get_preprocessed(test_texts, mode, root)
+    return _build_tfidf(path, train_clean, test_clean, vectorizer_params)
+
+
+def get_tfidf_from_corpus(
+    corpus: TokenizedCorpus,
+    train_idx: np.ndarray,
+    test_idx: np.ndarray,
+    root: Path = FEATURES_PATH,
+    **vectorizer_params,
+) -> TfidfFeatures:
+    """Comme get_tfidf, pour des sous-ensembles (indices) d'un corpus déjà
+    prétraité : évite de refaire le prétraitement et de refingerprinter les
+    textes. Les lignes des matrices suivent l'ordre de train_idx / test_idx."""
+    key = cache_key(
+        corpus=corpus.path.name,
+        train=hashlib.blake2b(np.asarray(train_idx).tobytes()).hexdigest(),
+        test=hashlib.blake2b(np.asarray(test_idx).tobytes()).hexdigest(),
+        params=vectorizer_params,
+    )
+    path = root / "tfidf" / f"corpus_{key}"
+
+    if path.is_dir():
+        return _load_tfidf(path)
+
+    return _build_tfidf(
+        path,
+        (corpus[i] for i in train_idx),
+        (corpus[i] for i in test_idx),
+        vectorizer_params,
+    )
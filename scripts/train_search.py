@@ -0,0 +1,409 @@
+import argparse
+import itertools
+import json
+import math
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, f1_score, roc_auc_score
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import Pipeline
+
+from feature_store import (
+    FEATURES_PATH,
+    TokenizedCorpus,
+    cache_key,
+    get_preprocessed,
+    get_tfidf_from_corpus,
+)
+
+ROOT = Path(__file__).resolve().parents[1]
+DATA_PATH = ROOT / "data"
+MODELS_PATH = ROOT / "models"
+
+DEFAULT_CSV = DATA_PATH / "training.1600000.processed.noemoticon.csv"
+COLUMNS = ["target", "ids", "date", "flag", "user", "text"]
+
+MAX_FEATURES = 50000
+
+# Données partagées par les workers (chargées une fois par processus).
+_corpus: TokenizedCorpus | None = None
+_labels: np.ndarray | None = None
+_train_order: np.ndarray | None = None
+_val_idx: np.ndarray | None = None
+_features_root: Path = FEATURES_PATH
+
+
+def build_grid(ngram_ranges, min_dfs, Cs, class_weights) -> list[dict]:
+    return [
+        {"ngram_range": ngram, "min_df": min_df, "C": C, "class_weight": cw}
+        for ngram, min_df, C, cw in itertools.product(
+            ngram_ranges, min_dfs, Cs, class_weights
+        )
+    ]
+
+
+def vectorizer_params(params: dict) -> dict:
+    return {
+        "max_features": MAX_FEATURES,
+        "ngram_range": tuple(params["ngram_range"]),
+        "min_df": params["min_df"],
+    }
+
+
+def build_classifier(params: dict) -> LogisticRegression:
+    return LogisticRegression(
+        max_iter=1000, C=params["C"], class_weight=params["class_weight"]
+    )
+
+
+def _init_worker(
+    corpus_path, labels, train_order, val_idx, memory_limit_mb, features_root
+):
+    global _corpus, _labels, _train_order, _val_idx, _features_root
+
+    if memory_limit_mb:
+        try:
+            import resource
+
+            limit = memory_limit_mb * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        except (ImportError, ValueError) as e:
+            print(f"[train_search] Limite mémoire non appliquée : {e}")
+
+    _corpus = TokenizedCorpus(Path(corpus_path))
+    _labels = labels
+    _train_order = train_order
+    _val_idx = val_idx
+    _features_root = Path(features_root)
+
+
+def _features(
+    corpus: TokenizedCorpus,
+    train_idx: np.ndarray,
+    val_idx: np.ndarray,
+    params: dict,
+    root: Path,
+):
+    return get_tfidf_from_corpus(
+        corpus, train_idx, val_idx, root=root, **vectorizer_params(params)
+    )
+
+
+def _worker_features(params: dict, n_samples: int):
+    return _features(
+        _corpus, _train_order[:n_samples], _val_idx, params, _features_root
+    )
+
+
+def _error_message(e: Exception) -> str:
+    return f"{type(e).__name__}: {e}"
+
+
+def run_vectorization(params: dict, n_samples: int) -> dict:
+    """Calcule (ou relit) les features TF-IDF d'un groupe (ngram_range, min_df)
+    pour un palier : elles sont ensuite partagées par tous les C / class_weight."""
+    result = {"status": "ok"}
+    start = time.perf_counter()
+    try:
+        _worker_features(params, n_samples)
+    except MemoryError:
+        result["status"] = "memory_limit"
+    except Exception as e:
+        # Ex. : "After pruning, no terms remain" pour un min_df trop grand.
+        result.update(status="error", error=_error_message(e))
+    result["vectorize_time_s"] = time.perf_counter() - start
+    return result
+
+
+def run_trial(params: dict, n_samples: int) -> dict:
+    """Entraîne le classifieur d'une configuration sur les features en cache des
+    n_samples premiers tweets du train (sous-échantillons emboîtés) et l'évalue
+    sur le jeu de validation.
+
+    Au dernier palier (train complet), le classifieur fitté est sauvegardé
+    (model_path) : le script le réutilise tel quel pour le modèle final.
+    """
+    result = {"params": params, "n_samples": n_samples, "status": "ok"}
+    start = time.perf_counter()
+    try:
+        X, X_val, _ = _worker_features(params, n_samples)
+
+        clf = build_classifier(params)
+        fit_start = time.perf_counter()
+        clf.fit(X, _labels[_train_order[:n_samples]])
+        fit_time = time.perf_counter() - fit_start
+
+        y_proba = clf.predict_proba(X_val)[:, 1]
+        y_val = _labels[_val_idx]
+        result.update(
+            accuracy=accuracy_score(y_val, y_proba >= 0.5),
+            f1=f1_score(y_val, y_proba >= 0.5),
+            roc_auc=roc_auc_score(y_val, y_proba),
+            fit_time_s=fit_time,
+            throughput_per_s=n_samples / fit_time,
+        )
+
+        if n_samples == len(_train_order):
+            model_path = (
+                _features_root / "classifiers" / f"{cache_key(**params)}.joblib"
+            )
+            model_path.parent.mkdir(parents=True, exist_ok=True)
+            joblib.dump(clf, model_path)
+            result["model_path"] = str(model_path)
+    except MemoryError:
+        result["status"] = "memory_limit"
+    except Exception as e:
+        result.update(status="error", error=_error_message(e))
+    result["wall_time_s"] = time.perf_counter() - start
+    return result
+
+
+def run_tasks(tasks: dict, make_executor) -> dict:
+    """Exécute {clé: (fn, args)} sur un pool et renvoie {clé: résultat}.
+
+    Si un worker meurt (OOM killer, abort sous RLIMIT_AS...), le pool est
+    cassé et toutes ses tâches non terminées échouent : chacune est alors
+    relancée seule dans un pool neuf, pour que seule la fautive soit marquée
+    worker_crashed (résultat None).
+
+    Une exception levée par une tâche (hors pool cassé) ne fait pas échouer
+    les autres : son résultat devient {"status": "error", "error": ...}.
+    """
+    results = {}
+    unfinished = []
+    with make_executor() as executor:
+        futures = {executor.submit(fn, *args): key for key, (fn, args) in tasks.items()}
+        for fut in as_completed(futures):
+            try:
+                results[futures[fut]] = fut.result()
+            except BrokenProcessPool:
+                unfinished.append(futures[fut])
+            except Exception as e:
+                results[futures[fut]] = {
+                    "status": "error",
+                    "error": _error_message(e),
+                }
+
+    for key in unfinished:
+        fn, args = tasks[key]
+        with make_executor(1) as executor:
+            try:
+                results[key] = executor.submit(fn, *args).result()
+            except BrokenProcessPool:
+                print(f"[train_search] Worker arrêté pendant la tâche {key}")
+                results[key] = None
+            except Exception as e:
+                results[key] = {"status": "error", "error": _error_message(e)}
+    return results
+
+
+def _group_key(params: dict) -> tuple:
+    return tuple(params["ngram_range"]), params["min_df"]
+
+
+def rung_sizes(min_samples: int, n_train: int, eta: int) -> list[int]:
+    sizes = []
+    n = min_samples
+    while n < n_train:
+        sizes.append(n)
+        n *= eta
+    sizes.append(n_train)
+    return sizes
+
+
+def successive_halving(
+    configs: list[dict], sizes: list[int], eta: int, make_executor
+) -> tuple[dict, list[dict]]:
+    """À chaque palier, seules les 1/eta meilleures configs (ROC AUC de
+    validation) passent au sous-échantillon suivant, eta fois plus grand.
+
+    make_executor(max_workers=None) doit créer un pool dont les workers sont
+    initialisés par _init_worker ; il est recréé si un worker meurt.
+    """
+    trials = []
+    survivors = configs
+    for rung, n_samples in enumerate(sizes):
+        print(
+            f"[train_search] Palier {rung} : {len(survivors)} configs "
+            f"sur {n_samples} tweets"
+        )
+
+        # 1) Une vectorisation TF-IDF par groupe (ngram_range, min_df).
+        groups = {_group_key(p): p for p in survivors}
+        vectorized = run_tasks(
+            {key: (run_vectorization, (p, n_samples)) for key, p in groups.items()},
+            make_executor,
+        )
+
+        # 2) Un entraînement de classifieur par config, sur les features en cache.
+        tasks = {}
+        for i, p in enumerate(survivors):
+            vec = vectorized[_group_key(p)]
+            if vec is not None and vec["status"] == "ok":
+                tasks[i] = (run_trial, (p, n_samples))
+        trained = run_tasks(tasks, make_executor)
+
+        results = []
+        for i, p in enumerate(survivors):
+            # None : worker mort pendant la tâche.
+            vec = vectorized[_group_key(p)] or {"status": "worker_crashed"}
+            outcome = trained[i] if vec["status"] == "ok" else vec
+            res = {
+                "params": p,
+                "n_samples": n_samples,
+                "status": "worker_crashed",
+                **(outcome or {}),
+                "rung": rung,
+            }
+            if "vectorize_time_s" in vec:
+                res["vectorize_time_s"] = vec["vectorize_time_s"]
+            trials.append(res)
+
+            if res["status"] == "ok":
+                results.append(res)
+                print(
+                    f"[train_search] {res['params']} -> "
+                    f"AUC={res['roc_auc']:.4f}, fit={res['fit_time_s']:.1f}s, "
+                    f"{res['throughput_per_s']:.0f} tweets/s"
+                )
+            else:
+                detail = f" ({res['error']})" if "error" in res else ""
+                print(f"[train_search] {res['params']} -> {res['status']}{detail}")
+
+        if not results:
+            raise RuntimeError(f"Aucune configuration valide au palier {rung}")
+
+        results.sort(key=lambda r: r["roc_auc"], reverse=True)
+        n_keep = max(1, math.ceil(len(results) / eta))
+        survivors = [r["params"] for r in results[:n_keep]]
+
+    return results[0], trials
+
+
+def next_model_version() -> int:
+    # v1 = models/tfidf_logreg.joblib (modèle du notebook 3)
+    versions = [
+        int(m.group(1))
+        for p in MODELS_PATH.glob("tfidf_logreg_v*.joblib")
+        if (m := re.fullmatch(r"tfidf_logreg_v(\d+)\.joblib", p.name))
+    ]
+    return max(versions, default=1) + 1
+
+
+def load_dataset(csv_path: Path, sample_size: int | None) -> pd.DataFrame:
+    df = pd.read_csv(csv_path, encoding="latin-1", header=None, names=COLUMNS)
+    df["label"] = (df["target"] == 4).astype(int)
+    if sample_size and len(df) > sample_size:
+        df = df.sample(sample_size, random_state=42)
+    return df.reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Recherche d'hyperparamètres TF-IDF + LogReg (successive halving)."
+    )
+    parser.add_argument("--csv", type=Path, default=DEFAULT_CSV)
+    parser.add_argument("--sample-size", type=int, default=None)
+    parser.add_argument("--ngram-max", nargs="+", type=int, default=[1, 2])
+    parser.add_argument("--min-df", nargs="+", type=int, default=[1, 2, 5])
+    parser.add_argument("--C", nargs="+", type=float, default=[0.1, 1.0, 10.0])
+    parser.add_argument("--class-weight", nargs="+", default=["none", "balanced"])
+    parser.add_argument("--min-samples", type=int, default=20_000)
+    parser.add_argument("--eta", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument(
+        "--memory-limit-mb",
+        type=int,
+        default=4096,
+        help="Mémoire max par worker (RLIMIT_AS, 0 = pas de limite).",
+    )
+    args = parser.parse_args()
+
+    total_start = time.perf_counter()
+
+    df = load_dataset(args.csv, args.sample_size)
+    corpus = get_preprocessed(df["text"].astype(str).tolist(), "simple")
+
+    # Même filtre que drop_short_texts(min_len=2) dans le notebook 3.
+    keep = np.flatnonzero(np.diff(corpus.offsets) >= 2)
+    labels = df["label"].to_numpy(dtype=np.int8)
+
+    train_idx, test_idx = train_test_split(
+        keep, test_size=0.2, random_state=42, stratify=labels[keep]
+    )
+    train_idx, val_idx = train_test_split(
+        train_idx, test_size=0.1, random_state=42, stratify=labels[train_idx]
+    )
+    train_order = np.random.default_rng(42).permutation(train_idx)
+
+    configs = build_grid(
+        [(1, n) for n in args.ngram_max],
+        args.min_df,
+        args.C,
+        [None if cw == "none" else cw for cw in args.class_weight],
+    )
+    sizes = rung_sizes(args.min_samples, len(train_order), args.eta)
+
+    initargs = (
+        str(corpus.path),
+        labels,
+        train_order,
+        val_idx,
+        args.memory_limit_mb,
+        str(FEATURES_PATH),
+    )
+
+    def make_executor(max_workers=None):
+        return ProcessPoolExecutor(
+            max_workers=max_workers or args.workers,
+            initializer=_init_worker,
+            initargs=initargs,
+        )
+
+    best, trials = successive_halving(configs, sizes, args.eta, make_executor)
+
+    print(f"[train_search] Meilleure config : {best['params']}")
+
+    # Le dernier palier couvre tout le train : le vectorizer (en cache) et le
+    # classifieur fitté par le worker sont réutilisés, sans réentraînement.
+    _, _, vectorizer = _features(
+        corpus, train_order, val_idx, best["params"], FEATURES_PATH
+    )
+    clf = joblib.load(best["model_path"])
+    pipe = Pipeline([("tfidf", vectorizer), ("clf", clf)])
+
+    y_proba = pipe.predict_proba([corpus[i] for i in test_idx])[:, 1]
+    y_test = labels[test_idx]
+    test_metrics = {
+        "accuracy": accuracy_score(y_test, y_proba >= 0.5),
+        "f1": f1_score(y_test, y_proba >= 0.5),
+        "roc_auc": roc_auc_score(y_test, y_proba),
+    }
+    print(f"[train_search] Test : {test_metrics}")
+
+    version = next_model_version()
+    model_path = MODELS_PATH / f"tfidf_logreg_v{version}.joblib"
+    joblib.dump(pipe, model_path)
+    (model_path.with_suffix(".json")).write_text(
+        json.dumps(
+            {
+                "params": best["params"],
+                "test_metrics": test_metrics,
+                "rung_sizes": sizes,
+                "trials": trials,
+                "total_wall_time_s": time.perf_counter() - total_start,
+            },
+            indent=2,
+            default=str,
+        ),
+        encoding="utf-8",
+    )
+    print(f"[train_search] Modèle sauvegardé dans : {model_path}")
@@ -26,6 +26,22 @@ def test_predict_endpoint_basic():
     assert data["label"] in (0, 1)
     assert data["label_str"] in ("negative", "positive")
     assert 0.0 <= data["proba"] <= 1.0
+    assert data["model"] == "tfidf_logreg"
+
+
+def test_predict_endpoint_unknown_model():
+    payload = {"text": "I love this airline", "model": "unknown_model"}
+    response = client.post("/predict", json=payload)
+
+    assert response.status_code == 400
+
+
+def test_models_endpoint():
+    response = client.get("/models")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert "tfidf_logreg" in data["available"]
 
 
 def test_feedback_endpoint_incorrect_prediction():
@@ -40,3 +56,53 @@ def test_feedback_endpoint_incorrect_prediction():
     assert response.status_code == 200
     data = response.json()
     assert data["status"] == "received"
+
+
+def test_drift_endpoint_counts_predictions():
+    client.post("/predict", json={"text": "Flight delayed again"})
+    response = client.get("/drift")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["n_texts"] >= 1
+    assert 0.0 <= data["oov_rate"] <= 1.0
+    assert abs(sum(data["proba_hist"]) - 1.0) < 1e-6
+
+
+def test_drift_histogram_reuses_reference_stage_proba(monkeypatch):
+    import api.main as main
+
+    calls = []
+
+    def fake_route(text, model_name):
+        calls.append(model_name)
+        return 0, 0.05, "heavy_model", {"tfidf_logreg": 0.55, "heavy_model": 0.05}
+
+    monkeypatch.setattr(main, "route_prediction_stages", fake_route)
+    before = list(main.DRIFT_MONITOR.proba_counts)
+
+    response = client.post("/predict", json={"text": "hmm", "model": "cascade"})
+
+    assert response.json()["proba"] == 0.05
+    assert calls == ["cascade"]
+    after = list(main.DRIFT_MONITOR.proba_counts)
+    assert after[5] == before[5] + 1
+    assert after[0] == before[0]
+
+
+def test_drift_failure_does_not_fail_predict(monkeypatch):
+    import api.main as main
+
+    def fake_route(text, model_name):
+        return 1, 0.9, "other_model", {"other_model": 0.9}
+
+    def broken_reference(text, model_name):
+        raise FileNotFoundError("tfidf_logreg.joblib")
+
+    monkeypatch.setattr(main, "route_prediction_stages", fake_route)
+    monkeypatch.setattr(main, "predict_sentiment", broken_reference)
+
+    response = client.post("/predict", json={"text": "hmm", "model": "other_model"})
+
+    assert response.status_code == 200
+    assert response.json()["model"] == "other_model"
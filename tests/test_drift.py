@@ -0,0 +1,64 @@
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+API_PATH = ROOT / "api"
+sys.path.append(str(API_PATH))
+
+from drift import CountMinSketch, DriftMonitor, psi
+
+
+def test_count_min_sketch_never_underestimates():
+    sketch = CountMinSketch(width=64, depth=3)
+    counts = {"flight": 5, "delay": 3, "love": 1}
+    for token, n in counts.items():
+        for _ in range(n):
+            sketch.add(token)
+
+    for token, n in counts.items():
+        assert sketch.estimate(token) >= n
+
+
+def test_drift_monitor_rates_and_histogram():
+    monitor = DriftMonitor(vocabulary={"flight", "delay"})
+    monitor.update("flight delay unknownword", 0.12)
+    monitor.update("", 0.95)
+
+    snap = monitor.snapshot()
+    assert snap["n_texts"] == 2
+    assert snap["oov_rate"] == 1 / 3
+    assert snap["empty_rate"] == 0.5
+    assert snap["proba_hist"][1] == 0.5
+    assert snap["proba_hist"][-1] == 0.5
+    assert "flight" in snap["top_tokens"]
+
+
+def test_psi_is_zero_for_identical_distributions():
+    hist = [0.1] * 10
+    assert psi(hist, hist) == 0.0
+    assert psi(hist, [1.0] + [0.0] * 9) > 0.0
+
+
+def test_token_report_against_saved_baseline(tmp_path):
+    baseline = DriftMonitor()
+    for _ in range(10):
+        baseline.update("flight delay crew", 0.3)
+    baseline.save_baseline(tmp_path / "baseline.json")
+
+    same = DriftMonitor()
+    same.load_baseline(tmp_path / "baseline.json")
+    for _ in range(5):
+        same.update("flight delay crew", 0.3)
+    report = same.report()
+    assert report["top_tokens_overlap"] == 1.0
+    assert report["psi_tokens"] < 1e-6
+    assert report["psi_proba"] < 1e-6
+
+    shifted = DriftMonitor()
+    shifted.load_baseline(tmp_path / "baseline.json")
+    for _ in range(5):
+        shifted.update("covid refund cancel", 0.3)
+    report = shifted.report()
+    assert report["top_tokens_overlap"] == 0.0
+    assert report["psi_tokens"] > 1.0
+    assert {f["token"] for f in report["token_freqs"]} >= {"flight", "refund"}
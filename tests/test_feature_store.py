@@ -0,0 +1,120 @@
+from pathlib import Path
+import sys
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPTS_PATH = ROOT / "scripts"
+sys.path.append(str(SCRIPTS_PATH))
+
+import feature_store
+from feature_store import (
+    get_preprocessed,
+    get_tfidf,
+    get_tfidf_from_corpus,
+    load_csr,
+    save_csr,
+)
+from preprocessing import preprocess_simple
+
+TRAIN_TEXTS = [
+    "I love this airline, great service!",
+    "Worst flight ever, my luggage is lost",
+    "Great crew and a smooth flight",
+]
+TEST_TEXTS = ["Lost luggage again, terrible service"]
+
+
+def test_preprocessed_cache_roundtrip(tmp_path):
+    corpus = get_preprocessed(TRAIN_TEXTS, "simple", root=tmp_path)
+
+    assert len(corpus) == len(TRAIN_TEXTS)
+    assert list(corpus) == [preprocess_simple(t) for t in TRAIN_TEXTS]
+
+
+def test_tfidf_cache_reloads_same_matrices(tmp_path):
+    X_train, X_test, vectorizer = get_tfidf(
+        TRAIN_TEXTS, TEST_TEXTS, "simple", root=tmp_path, ngram_range=(1, 2)
+    )
+    X_train_cached, X_test_cached, _ = get_tfidf(
+        TRAIN_TEXTS, TEST_TEXTS, "simple", root=tmp_path, ngram_range=(1, 2)
+    )
+
+    assert X_train.shape[0] == len(TRAIN_TEXTS)
+    assert X_test.shape[1] == len(vectorizer.vocabulary_)
+    assert np.allclose(X_train.toarray(), X_train_cached.toarray())
+    assert np.allclose(X_test.toarray(), X_test_cached.toarray())
+
+
+def test_save_and_load_csr(tmp_path):
+    from scipy import sparse
+
+    matrix = sparse.random(5, 7, density=0.3, format="csr", random_state=0)
+    save_csr(matrix, tmp_path / "m")
+
+    loaded = load_csr(tmp_path / "m")
+    assert loaded.shape == matrix.shape
+    assert np.allclose(loaded.toarray(), matrix.toarray())
+
+
+def _fail(*args, **kwargs):
+    raise AssertionError("le cache aurait dû être utilisé")
+
+
+def test_preprocessed_cache_skips_preprocess(tmp_path, monkeypatch):
+    corpus = get_preprocessed(TRAIN_TEXTS, "simple", root=tmp_path)
+    monkeypatch.setattr(feature_store, "preprocess", _fail)
+
+    cached = get_preprocessed(TRAIN_TEXTS, "simple", root=tmp_path)
+
+    assert cached.path == corpus.path
+    assert list(cached) == list(corpus)
+
+
+def test_preprocessing_version_invalidates_cache(tmp_path, monkeypatch):
+    corpus = get_preprocessed(TRAIN_TEXTS, "simple", root=tmp_path)
+    monkeypatch.setattr(feature_store, "PREPROCESSING_VERSION", "autre")
+
+    assert get_preprocessed(TRAIN_TEXTS, "simple", root=tmp_path).path != corpus.path
+
+
+def test_tfidf_cache_skips_vectorizer(tmp_path, monkeypatch):
+    X_train, _, _ = get_tfidf(TRAIN_TEXTS, TEST_TEXTS, "simple", root=tmp_path)
+    monkeypatch.setattr(feature_store, "TfidfVectorizer", _fail)
+    monkeypatch.setattr(feature_store, "preprocess", _fail)
+
+    X_train_cached, _, _ = get_tfidf(TRAIN_TEXTS, TEST_TEXTS, "simple", root=tmp_path)
+
+    assert np.allclose(X_train.toarray(), X_train_cached.toarray())
+
+
+def test_tfidf_from_corpus_follows_indices_and_caches(tmp_path, monkeypatch):
+    corpus = get_preprocessed(TRAIN_TEXTS + TEST_TEXTS, "simple", root=tmp_path)
+    train_idx, test_idx = np.array([2, 0]), np.array([3])
+
+    X_train, X_test, vectorizer = get_tfidf_from_corpus(
+        corpus, train_idx, test_idx, root=tmp_path
+    )
+    expected = vectorizer.transform([corpus[2], corpus[0]])
+    assert X_train.shape[0] == 2 and X_test.shape[0] == 1
+    assert np.allclose(X_train.toarray(), expected.toarray())
+
+    monkeypatch.setattr(feature_store, "TfidfVectorizer", _fail)
+    X_train_cached, _, _ = get_tfidf_from_corpus(
+        corpus, train_idx, test_idx, root=tmp_path
+    )
+    assert np.allclose(X_train.toarray(), X_train_cached.toarray())
+
+    # Autres indices -> autre entrée de cache, donc un nouveau fit.
+    with pytest.raises(AssertionError):
+        get_tfidf_from_corpus(corpus, np.array([0, 1]), test_idx, root=tmp_path)
+
+
+def test_interrupted_write_leaves_no_entry(tmp_path, monkeypatch):
+    monkeypatch.setattr(feature_store.joblib, "dump", _fail)
+
+    with pytest.raises(AssertionError):
+        get_tfidf(TRAIN_TEXTS, TEST_TEXTS, "simple", root=tmp_path)
+
+    assert list((tmp_path / "tfidf").iterdir()) == []
@@ -5,7 +5,17 @@ ROOT = Path(__file__).resolve().parents[1]
 API_PATH = ROOT / "api"
 sys.path.append(str(API_PATH))
 
-from model_loader import load_model, predict_sentiment, label_to_str
+import numpy as np
+import pytest
+
+import model_loader
+from model_loader import (
+    load_model,
+    predict_sentiment,
+    label_to_str,
+    route_prediction,
+    available_models,
+)
 
 
 def test_load_model_returns_sklearn_pipeline():
@@ -23,3 +33,76 @@ def test_predict_sentiment_output_types_and_ranges():
 
     label_str = label_to_str(label)
     assert label_str in ("negative", "positive")
+
+
+def test_available_models_contains_tfidf_baseline():
+    assert "tfidf_logreg" in available_models()
+
+
+def test_route_prediction_unknown_model_raises():
+    with pytest.raises(ValueError):
+        route_prediction("I love this airline", "unknown_model")
+
+
+class StubModel:
+    def __init__(self, proba_pos):
+        self.proba_pos = proba_pos
+        self.calls = 0
+
+    def predict_proba(self, texts):
+        self.calls += 1
+        return np.array([[1.0 - self.proba_pos, self.proba_pos]] * len(texts))
+
+
+@pytest.fixture
+def stub_cascade(monkeypatch, tmp_path):
+    def _install(fast_proba, heavy_proba):
+        fast, heavy = StubModel(fast_proba), StubModel(heavy_proba)
+        for name, stub in (("stub_fast", fast), ("stub_heavy", heavy)):
+            path = tmp_path / name
+            path.touch()
+            monkeypatch.setitem(
+                model_loader.MODEL_REGISTRY,
+                name,
+                {"path": path, "mode": "bert", "kind": "sklearn"},
+            )
+            monkeypatch.setitem(model_loader._models, name, stub)
+        monkeypatch.setattr(model_loader, "CASCADE_MODELS", ["stub_fast", "stub_heavy"])
+        monkeypatch.setattr(model_loader, "CASCADE_MARGIN", 0.15)
+        return fast, heavy
+
+    return _install
+
+
+def test_cascade_escalates_when_proba_is_ambiguous(stub_cascade):
+    fast, heavy = stub_cascade(fast_proba=0.55, heavy_proba=0.1)
+
+    label, proba, model_used = route_prediction("Not sure about this flight", "cascade")
+
+    assert fast.calls == 1
+    assert heavy.calls == 1
+    assert model_used == "stub_heavy"
+    assert (label, proba) == (0, pytest.approx(0.1))
+
+
+def test_cascade_skips_heavy_model_when_confident(stub_cascade):
+    fast, heavy = stub_cascade(fast_proba=0.9, heavy_proba=0.1)
+
+    label, proba, model_used = route_prediction("I love this airline", "cascade")
+
+    assert fast.calls == 1
+    assert heavy.calls == 0
+    assert model_used == "stub_fast"
+    assert (label, proba) == (1, pytest.approx(0.9))
+
+
+def test_cascade_drops_missing_stage(stub_cascade, monkeypatch, tmp_path):
+    fast, heavy = stub_cascade(fast_proba=0.55, heavy_proba=0.1)
+    monkeypatch.setitem(
+        model_loader.MODEL_REGISTRY["stub_heavy"], "path", tmp_path / "missing"
+    )
+
+    assert model_loader.cascade_stages() == ["stub_fast"]
+    _, _, model_used = route_prediction("Not sure about this flight", "cascade")
+    assert model_used == "stub_fast"
+    assert heavy.calls == 0
@@ -0,0 +1,38 @@
+from pathlib import Path
+import sys
+
+import pytest
+
+pytest.importorskip("onnxruntime")
+pytest.importorskip("skl2onnx")
+
+ROOT = Path(__file__).resolve().parents[1]
+API_PATH = ROOT / "api"
+SCRIPTS_PATH = ROOT / "scripts"
+sys.path.append(str(API_PATH))
+sys.path.append(str(SCRIPTS_PATH))
+
+from export_onnx import export_tfidf_logreg
+from model_loader import OnnxSentimentModel, MODEL_PATH, predict_sentiment
+from preprocessing import preprocess_simple
+
+SAMPLE_TWEETS = [
+    "I love this airline, it was amazing!",
+    "Worst flight ever, my luggage is lost again",
+    "The crew was friendly but the seats were not comfortable",
+    "@AirParadis flight delayed http://t.co/xyz",
+    "ok",
+]
+
+
+def test_onnx_backend_matches_predict_sentiment(tmp_path):
+    onnx_path = export_tfidf_logreg(MODEL_PATH, tmp_path / "tfidf_logreg.onnx")
+    onnx_model = OnnxSentimentModel(onnx_path)
+
+    texts_clean = [preprocess_simple(t) for t in SAMPLE_TWEETS]
+    probas_onnx = onnx_model.predict_proba(texts_clean)[:, 1]
+
+    for text, proba_onnx in zip(SAMPLE_TWEETS, probas_onnx):
+        label, proba = predict_sentiment(text, "tfidf_logreg")
+        assert proba_onnx == pytest.approx(proba, abs=1e-4)
+        assert int(proba_onnx >= 0.5) == label
@@ -0,0 +1,109 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+import os
+import sys
+
+import joblib
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPTS_PATH = ROOT / "scripts"
+sys.path.append(str(SCRIPTS_PATH))
+
+from feature_store import TokenizedCorpus
+from train_search import (
+    _init_worker,
+    build_grid,
+    rung_sizes,
+    run_tasks,
+    successive_halving,
+)
+
+TEXTS = [
+    "love great service",
+    "worst flight ever",
+    "great crew smooth flight",
+    "lost luggage terrible",
+    "amazing experience thanks",
+    "delayed again awful",
+] * 5
+LABELS = np.array([1, 0, 1, 0, 1, 0] * 5, dtype=np.int8)
+
+
+def _square(x):
+    return x * x
+
+
+def _crash(x):
+    os._exit(1)
+
+
+def _raise(x):
+    raise ValueError("After pruning, no terms remain")
+
+
+def _init_test_worker(tmp_path):
+    corpus = TokenizedCorpus.build(TEXTS, tmp_path / "corpus")
+    features_root = tmp_path / "features"
+    _init_worker(
+        str(corpus.path), LABELS, np.arange(24), np.arange(24, 30), 0, features_root
+    )
+    return features_root
+
+
+def _thread_executor(max_workers=None):
+    return ThreadPoolExecutor(max_workers=max_workers or 2)
+
+
+def test_rung_sizes_grow_by_eta_and_end_on_full_train():
+    assert rung_sizes(100, 1000, 3) == [100, 300, 900, 1000]
+    assert rung_sizes(5000, 1000, 3) == [1000]
+
+
+def test_build_grid_is_cartesian_product():
+    grid = build_grid([(1, 1), (1, 2)], [1, 2], [0.1, 1.0], [None])
+    assert len(grid) == 8
+
+
+def test_successive_halving_vectorizes_once_per_group_and_rung(tmp_path):
+    features_root = _init_test_worker(tmp_path)
+
+    configs = build_grid([(1, 1)], [1], [0.1, 1.0, 10.0], [None, "balanced"])
+    best, trials = successive_halving(configs, [12, 24], 3, _thread_executor)
+
+    assert best["status"] == "ok"
+    assert best["n_samples"] == 24
+    assert len(trials) == len(configs) + 2
+    # 1 groupe (ngram_range, min_df) x 2 paliers = 2 vectorisations en cache.
+    assert len(list((features_root / "tfidf").iterdir())) == 2
+    # Le classifieur du dernier palier est réutilisé comme modèle final.
+    clf = joblib.load(best["model_path"])
+    assert clf.C == best["params"]["C"]
+
+
+def test_successive_halving_records_failing_configs(tmp_path):
+    _init_test_worker(tmp_path)
+
+    # min_df=50 > nombre de tweets : le TfidfVectorizer lève un ValueError.
+    configs = build_grid([(1, 1)], [1, 50], [1.0], [None])
+    best, trials = successive_halving(configs, [12, 24], 3, _thread_executor)
+
+    assert best["params"]["min_df"] == 1
+    failed = [t for t in trials if t["params"]["min_df"] == 50]
+    assert [t["status"] for t in failed] == ["error"]
+    assert "ValueError" in failed[0]["error"]
+
+
+def test_run_tasks_isolates_crashing_worker():
+    def make_executor(max_workers=None):
+        return ProcessPoolExecutor(max_workers=max_workers or 2)
+
+    tasks = {i: (_square, (i,)) for i in range(4)}
+    tasks["boom"] = (_crash, (0,))
+    tasks["error"] = (_raise, (0,))
+
+    results = run_tasks(tasks, make_executor)
+
+    assert results["boom"] is None
+    assert results["error"]["status"] == "error"
+    assert [results[i] for i in range(4)] == [0, 1, 4, 9]